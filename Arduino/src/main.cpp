@@ -18,30 +18,32 @@
 #endif
 
 // Protocol message codes for communication with Pico
+// Codes start at 0x20 so no code byte can ever equal the '\n' (0x0A)
+// frame terminator or any other control character
 enum MessageCode : uint8_t {
   // Arduino -> Pico messages
-  MSG_STATUS_READY = 1,
-  MSG_MOTION_DETECTED = 2,
-  MSG_MOTION_STOPPED = 3,
-  MSG_RFID_DETECTED = 4,
-  MSG_BUTTON_PRESSED = 5,
-  MSG_RFID_READ_SUCCESS = 6,
-  MSG_RFID_READ_FAILED = 7,
-  MSG_RFID_WRITE_SUCCESS = 8,
-  MSG_RFID_WRITE_FAILED = 9,
-  MSG_RFID_WRITE_COMPLETED = 10,
-  MSG_STATUS_UPDATE = 11,      // General status update
-  MSG_HEARTBEAT = 12,          // Periodic heartbeat to indicate Arduino is alive
-  
+  MSG_STATUS_READY = 32,
+  MSG_MOTION_DETECTED = 33,
+  MSG_MOTION_STOPPED = 34,
+  MSG_RFID_DETECTED = 35,
+  MSG_BUTTON_PRESSED = 36,
+  MSG_RFID_READ_SUCCESS = 37,
+  MSG_RFID_READ_FAILED = 38,
+  MSG_RFID_WRITE_SUCCESS = 39,
+  MSG_RFID_WRITE_FAILED = 40,
+  MSG_RFID_WRITE_COMPLETED = 41,
+  MSG_STATUS_UPDATE = 42,      // General status update
+  MSG_HEARTBEAT = 43,          // Periodic heartbeat to indicate Arduino is alive
+
   // Pico -> Arduino commands
-  CMD_SET_LED_RGB = 20,        // Takes RGB data: "r,g,b" (0-255 each)
-  CMD_SET_BUZZER_ON = 21,
-  CMD_SET_BUZZER_OFF = 22,
-  CMD_RFID_WRITE_PREPARE = 23, // Prepare for RFID write (store key but don't activate)
-  CMD_RFID_WRITE_CONFIRM = 24, // Confirm and activate RFID write mode
-  CMD_RFID_NORMAL_MODE = 25,
-  CMD_ACK = 26,
-  CMD_REQUEST_STATUS = 27     // Request status update
+  CMD_SET_LED_RGB = 64,        // Takes RGB data: "r,g,b" (0-255 each)
+  CMD_SET_BUZZER_ON = 65,
+  CMD_SET_BUZZER_OFF = 66,
+  CMD_RFID_WRITE_PREPARE = 67, // Prepare for RFID write (store key but don't activate)
+  CMD_RFID_WRITE_CONFIRM = 68, // Confirm and activate RFID write mode
+  CMD_RFID_NORMAL_MODE = 69,
+  CMD_ACK = 70,
+  CMD_REQUEST_STATUS = 71     // Request status update
 };
 
 // Hardware pins
@@ -201,6 +203,7 @@ void sendMessage(MessageCode code) {
   DEBUG_PRINT(F("Sending message to Pico: "));
   DEBUG_PRINTLN(code);
   picoSerial.write((uint8_t)code);
+  picoSerial.write('\n');  // Every message is newline-terminated so the Pico can frame without timing heuristics
 }
 
 void sendMessageWithData(MessageCode code, const char* data) {
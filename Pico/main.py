@@ -1,10 +1,22 @@
 import network
+import socket
 import time
 import ubinascii
 import machine
 from machine import UART
 import gc
 
+try:
+    import uasyncio as asyncio
+except ImportError:
+    import asyncio
+
+try:
+    from micropython import const
+except ImportError:
+    def const(x):  # Fallback so the file still runs off-device
+        return x
+
 # Try to import MQTT, handle if not available
 try:
     from umqtt.simple import MQTTClient # type: ignore
@@ -13,6 +25,11 @@ except ImportError:
     print("MQTT library not available - running in debug mode")
     MQTT_AVAILABLE = False
 
+# Debug logging - with const(0) the MicroPython compiler folds the
+# `if DEBUG:` branches away entirely, so hot-path prints cost nothing.
+# Set to const(1) to get the verbose event log back.
+DEBUG = const(0)
+
 # WiFi credentials
 ssid = 'NETWORK_NAME_HERE' # Replace with your WiFi SSID
 password = 'NETWORK_PASSWORD_HERE' # Replace with your WiFi password
@@ -28,29 +45,61 @@ topic_sub = b'home/arduino/command'
 topic_auth_request = b'home/arduino/auth_requests'
 topic_auth_response = b'home/arduino/auth_response'
 
+# Pre-encoded MQTT payloads - umqtt re-encodes str payloads to bytes on
+# every publish, so the static messages are built once here instead
+PUB_PICO_READY = b'PICO_READY'
+PUB_PICO_OFFLINE = b'PICO_OFFLINE'
+PUB_STATUS_READY = b'STATUS_READY'
+PUB_MOTION_DETECTED = b'MOTION_DETECTED'
+PUB_MOTION_STOPPED = b'MOTION_STOPPED'
+PUB_ALARM_TRIGGERED = b'ALARM_TRIGGERED'
+PUB_ALARM_RESET = b'ALARM_RESET'
+PUB_ALARM_REARMED = b'ALARM_REARMED'
+PUB_ALARM_DISABLED_RFID = b'ALARM_DISABLED_RFID'
+PUB_AUTH_FAILED = b'AUTH_FAILED'
+PUB_AUTH_SUCCESS_BLOCKED = b'AUTH_SUCCESS_BLOCKED'
+PUB_ACK_AUTH_SUCCESS = b'ACK_AUTH_SUCCESS'
+PUB_ACK_AUTH_FAILED = b'ACK_AUTH_FAILED'
+PUB_ACK_CMD_DISABLE_ALARM = b'ACK_CMD_DISABLE_ALARM'
+PUB_ACK_CMD_ACTIVATE_ALARM = b'ACK_CMD_ACTIVATE_ALARM'
+PUB_ACK_CMD_ABORT = b'ACK_CMD_ABORT'
+PUB_ACK_CMD_RFID_WRITE_INITALIZE = b'ACK_CMD_RFID_WRITE_INITALIZE'
+PUB_SECURITY_STATE_READY = b'SECURITY_STATE:READY'
+PUB_RFID_READ_FAILED = b'RFID_READ_FAILED'
+PUB_STATUS_RFID_WRITE_SUCCESS = b'STATUS_RFID_WRITE_SUCCESS'
+PUB_STATUS_RFID_WRITE_FAILED = b'STATUS_RFID_WRITE_FAILED'
+PUB_STATUS_RFID_WRITE_COMPLETED = b'STATUS_RFID_WRITE_COMPLETED'
+PUB_STATUS_RFID_WRITE_ACTIVE = b'STATUS_RFID_WRITE_ACTIVE'
+PUB_ERROR_RFID_WRITE_NOT_PREPARED = b'ERROR_RFID_WRITE_NOT_PREPARED'
+PUB_ARDUINO_HEARTBEAT = b'ARDUINO_HEARTBEAT'
+PUB_ARDUINO_CONNECTED = b'ARDUINO_CONNECTED'
+PUB_ARDUINO_DISCONNECTED = b'ARDUINO_DISCONNECTED'
+
 # Message codes from Arduino
-MSG_STATUS_READY = 1
-MSG_MOTION_DETECTED = 2
-MSG_MOTION_STOPPED = 3
-MSG_RFID_DETECTED = 4
-MSG_BUTTON_PRESSED = 5
-MSG_RFID_READ_SUCCESS = 6
-MSG_RFID_READ_FAILED = 7
-MSG_RFID_WRITE_SUCCESS = 8
-MSG_RFID_WRITE_FAILED = 9
-MSG_RFID_WRITE_COMPLETED = 10
-MSG_STATUS_UPDATE = 11       # General status update
-MSG_HEARTBEAT = 12          # Periodic heartbeat from Arduino
+# Codes start at 0x20 so no code byte can ever equal the '\n' (0x0A)
+# frame terminator or any other control character
+MSG_STATUS_READY = const(32)
+MSG_MOTION_DETECTED = const(33)
+MSG_MOTION_STOPPED = const(34)
+MSG_RFID_DETECTED = const(35)
+MSG_BUTTON_PRESSED = const(36)
+MSG_RFID_READ_SUCCESS = const(37)
+MSG_RFID_READ_FAILED = const(38)
+MSG_RFID_WRITE_SUCCESS = const(39)
+MSG_RFID_WRITE_FAILED = const(40)
+MSG_RFID_WRITE_COMPLETED = const(41)
+MSG_STATUS_UPDATE = const(42)       # General status update
+MSG_HEARTBEAT = const(43)          # Periodic heartbeat from Arduino
 
 # Commands to Arduino
-CMD_SET_LED_RGB = 20          # Takes RGB data: "r,g,b" or "RRGGBB"
-CMD_SET_BUZZER_ON = 21
-CMD_SET_BUZZER_OFF = 22
-CMD_RFID_WRITE_PREPARE = 23   # Prepare for RFID write (store key but don't activate)
-CMD_RFID_WRITE_CONFIRM = 24   # Confirm and activate RFID write mode
-CMD_RFID_NORMAL_MODE = 25
-CMD_ACK = 26
-CMD_REQUEST_STATUS = 27       # Request status update
+CMD_SET_LED_RGB = const(64)          # Takes RGB data: "r,g,b" or "RRGGBB"
+CMD_SET_BUZZER_ON = const(65)
+CMD_SET_BUZZER_OFF = const(66)
+CMD_RFID_WRITE_PREPARE = const(67)   # Prepare for RFID write (store key but don't activate)
+CMD_RFID_WRITE_CONFIRM = const(68)   # Confirm and activate RFID write mode
+CMD_RFID_NORMAL_MODE = const(69)
+CMD_ACK = const(70)
+CMD_REQUEST_STATUS = const(71)       # Request status update
 
 # Predefined LED colors
 LED_OFF = (0, 0, 0)
@@ -63,31 +112,58 @@ LED_CYAN = (0, 255, 255)
 LED_WHITE = (255, 255, 255)
 LED_ORANGE = (255, 165, 0)
 
-# Security system state
-class SecurityState:
-    READY = "READY"
-    MOTION_DETECTED = "MOTION_DETECTED"
-    ALARM_ACTIVE = "ALARM_ACTIVE"
-    ALARM_DISABLED = "ALARM_DISABLED"
-    RFID_WRITE_MODE = "RFID_WRITE_MODE"
+# Pre-encoded "r,g,b" payloads for the predefined colors - built once so
+# set_led_color doesn't re-format the same string on every blink tick
+LED_BYTES = {
+    LED_OFF: b'0,0,0',
+    LED_RED: b'255,0,0',
+    LED_GREEN: b'0,255,0',
+    LED_BLUE: b'0,0,255',
+    LED_YELLOW: b'255,255,0',
+    LED_PURPLE: b'255,0,255',
+    LED_CYAN: b'0,255,255',
+    LED_WHITE: b'255,255,255',
+    LED_ORANGE: b'255,165,0',
+}
+
+# Security system states - small ints so a state comparison is a single
+# integer compare instead of a string compare
+STATE_READY = const(0)
+STATE_MOTION_DETECTED = const(1)
+STATE_ALARM_ACTIVE = const(2)
+STATE_ALARM_DISABLED = const(3)
+STATE_RFID_WRITE_MODE = const(4)
+
+class SecurityContext:
+    """Bundles the mutable security/alarm state into one object
+
+    Handlers read and write instance attributes instead of a handful of
+    module globals, which avoids a global declaration plus a module-dict
+    store per assignment in every handler.
+    """
+    def __init__(self):
+        self.current_state = STATE_READY
+        self.motion_start_time = 0
+        self.alarm_disabled_time = 0
+        self.manually_activated = False       # Track if alarm was manually activated
+        self.alarm_disable_end_time = 0       # When timed disable ends
+        self.alarm_disable_permanent = False  # If alarm is permanently disabled
 
 # State variables
-current_state = SecurityState.READY
-motion_start_time = 0
-alarm_disabled_time = 0
-alarm_disable_duration = 60000  # 60 seconds in milliseconds
-motion_grace_period = 5000      # 5 seconds in milliseconds
-current_rfid_secret = None
-authenticated_keys = set()
-
-# Alarm control variables
-manually_activated = False      # Track if alarm was manually activated
-alarm_disable_end_time = 0     # When timed disable ends
-alarm_disable_permanent = False # If alarm is permanently disabled
+ctx = SecurityContext()
+alarm_disable_duration = const(60000)  # 60 seconds in milliseconds
+motion_grace_period = const(5000)      # 5 seconds in milliseconds
+
+# Fixed-capacity slot for the most recent RFID secret - reused across
+# scans via slice assignment so a card read doesn't allocate
+rfid_secret_max = const(32)
+current_rfid_secret = bytearray(rfid_secret_max)
+current_rfid_secret_len = 0
+authenticated_keys = {}  # Keyed by bytes secrets (stable hash, no per-lookup encode)
 
 # Arduino heartbeat monitoring
 last_arduino_heartbeat = 0
-arduino_timeout = 30000  # 30 seconds without heartbeat = communication error
+arduino_timeout = const(30000)  # 30 seconds without heartbeat = communication error
 arduino_connected = False
 
 # LED blinking state for async operation
@@ -95,14 +171,10 @@ led_blink_active = False
 led_blink_count = 0
 led_blink_max_count = 0
 led_blink_last_time = 0
-led_blink_interval = 200  # 200ms for each on/off phase
+led_blink_interval = const(200)  # 200ms for each on/off phase
 led_blink_is_on = False
 led_blink_color = LED_OFF  # Current blink color
 
-# Pico heartbeat for client communication
-last_pico_heartbeat = 0
-pico_heartbeat_interval = 15000  # Send heartbeat every 15 seconds
-
 def connect_wifi():
     """Connect to WiFi with error handling"""
     wlan = network.WLAN(network.STA_IF)
@@ -134,12 +206,12 @@ def connect_wifi():
 
 # MQTT Callback - Handle commands from server
 def sub_cb(topic, msg):
-    print('MQTT Message received:', topic, msg)
-    global current_state
-    
+    if DEBUG:
+        print('MQTT Message received:', topic, msg)
+
     try:
         msg_str = msg.decode('utf-8')
-        
+
         # Handle authentication responses
         if topic == topic_auth_response:
             if msg_str == "AUTH_SUCCESS":
@@ -147,31 +219,21 @@ def sub_cb(topic, msg):
             elif msg_str == "AUTH_FAILED":
                 handle_auth_failed()
             return
-            
-        # Handle other commands
-        if msg_str == "CMD_DISABLE_ALARM":
-            disable_alarm()
-        elif msg_str == "CMD_ACTIVATE_ALARM":
-            activate_alarm_manual()
-        elif msg_str == "CMD_RESET_ALARM":
-            reset_alarm()
-        elif msg_str == "CMD_DISABLE_ALARM_PERMANENT":
-            disable_alarm_permanent()
-        elif msg_str.startswith("CMD_DISABLE_ALARM_TIMED:"):
-            minutes = int(msg_str[25:])  # Extract minutes after "CMD_DISABLE_ALARM_TIMED:"
-            disable_alarm_timed(minutes)
-        elif msg_str == "CMD_ENABLE_ALARM":
-            enable_alarm()
-        elif msg_str.startswith("CMD_RFID_WRITE_PREPARE:"):
-            secret_key = msg_str[23:]  # Extract key after "CMD_RFID_WRITE_PREPARE:"
-            prepare_rfid_write_mode(secret_key)
-        elif msg_str == "CMD_RFID_WRITE_CONFIRM":
-            confirm_rfid_write_mode()
-        elif msg_str == "CMD_ABORT":
-            abort_operation()
-        elif msg_str == "CMD_RFID_WRITE_INITALIZE":
-            initialize_rfid_write()
-            
+
+        # Handle other commands - O(1) jump table lookup
+        handler = MQTT_DISPATCH.get(msg_str)
+        if handler:
+            handler()
+            return
+
+        # Parameterized commands ("PREFIX:arg") - split once and dispatch
+        # on the prefix instead of hand-counted slice offsets
+        prefix, sep, arg = msg_str.partition(":")
+        if sep:
+            handler = MQTT_PARAM_DISPATCH.get(prefix)
+            if handler:
+                handler(arg)
+
     except Exception as e:
         print("Error processing MQTT message:", e)
 
@@ -188,15 +250,32 @@ def connect_mqtt():
         print(f"  Publishing to: {topic_pub}")
         print(f"  Subscribing to: {topic_sub}, {topic_auth_response}")
         
-        client = MQTTClient(client_id, mqtt_server, port=mqtt_port, keepalive=60)
+        # A short keep-alive makes the broker's PINGREQ/PINGRESP exchange
+        # the liveness signal; the last will tells subscribers when the
+        # Pico drops off without a separate application heartbeat
+        client = MQTTClient(client_id, mqtt_server, port=mqtt_port, keepalive=20)
         client.set_callback(sub_cb)
+        client.set_last_will(topic_pub, PUB_PICO_OFFLINE, retain=True, qos=1)
         
         print(f'Connecting to MQTT broker at {mqtt_server}:{mqtt_port}')
         client.connect()
-        
+
+        # Disable Nagle's algorithm so a burst of publishes goes straight
+        # onto the wire instead of waiting ~40ms for the previous ACK
+        try:
+            client.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except (AttributeError, OSError) as e:
+            print(f"Could not set TCP_NODELAY: {e}")
+
         client.subscribe(topic_sub)
         client.subscribe(topic_auth_response)
-        
+
+        # Published retained so it overwrites a stale retained PICO_OFFLINE
+        # will left behind by an earlier ungraceful disconnect - otherwise
+        # every (re)subscribing client would see the Pico as offline until
+        # the next reboot
+        client.publish(topic_pub, PUB_PICO_READY, retain=True, qos=1)
+
         print('MQTT Connected & Subscribed successfully!')
         return client
         
@@ -231,20 +310,46 @@ LED_CYAN = (0, 255, 255)
 LED_WHITE = (255, 255, 255)
 LED_ORANGE = (255, 165, 0)
 
-def safe_mqtt_publish(topic, message):
-    """Safely publish MQTT message with error handling"""
+# Outbound MQTT queue - messages are collected here and flushed once per
+# main loop iteration so back-to-back publishes ride one TCP burst
+mqtt_out_queue = []
+mqtt_queue_max = const(16)
+
+def safe_mqtt_publish(topic, message, flush=False):
+    """Queue an MQTT message for publishing, with error handling
+
+    Messages are flushed at the end of each main loop iteration; pass
+    flush=True for messages that must go out immediately.
+    """
     if client is None:
         print(f"MQTT not available - would publish: {topic}: {message}")
         return False
-    
-    try:
-        client.publish(topic, message)
-        print(f"MQTT published: {topic.decode()} -> {message}")
-        return True
-    except Exception as e:
-        print(f"MQTT publish failed: {e}")
+
+    if len(mqtt_out_queue) >= mqtt_queue_max:
+        _flush_mqtt()  # Queue full - push everything out now
+
+    mqtt_out_queue.append((topic, message))
+    if flush:
+        return _flush_mqtt()
+    return True
+
+def _flush_mqtt():
+    """Publish all queued MQTT messages in one burst"""
+    if client is None or not mqtt_out_queue:
         return False
 
+    all_sent = True
+    for topic, message in mqtt_out_queue:
+        try:
+            client.publish(topic, message)
+            if DEBUG:
+                print(f"MQTT published: {topic.decode()} -> {message}")
+        except Exception as e:
+            print(f"MQTT publish failed: {e}")
+            all_sent = False
+    del mqtt_out_queue[:]
+    return all_sent
+
 def safe_mqtt_check():
     """Safely check MQTT messages with error handling"""
     if client is None:
@@ -264,46 +369,67 @@ def send_uart_command(cmd):
     """Send a command code to Arduino"""
     uart.write(bytes([cmd]))
 
+# Reusable TX frame buffer so sending a command doesn't allocate per call
+uart_tx_buf = bytearray()
+
 def send_uart_command_with_data(cmd, data):
-    """Send a command with data to Arduino"""
-    uart.write(bytes([cmd]))
-    uart.write(b':')
-    uart.write(data.encode('utf-8'))
-    uart.write(b'\n')
+    """Send a command with data to Arduino in a single write"""
+    send_uart_command_with_bytes(cmd, data.encode('utf-8'))
+
+def send_uart_command_with_bytes(cmd, data):
+    """Assemble a "cmd:data\\n" frame in the shared TX buffer and write it once"""
+    # Slice assignment - MicroPython bytearrays don't support `del buf[:]`
+    uart_tx_buf[:] = b""
+    uart_tx_buf.append(cmd)
+    uart_tx_buf.append(0x3A)  # ':'
+    uart_tx_buf.extend(data)
+    uart_tx_buf.append(0x0A)  # '\n'
+    uart.write(uart_tx_buf)
+
+def set_led_tuple(color):
+    """Fast path for (r, g, b) tuples - the only form internal callers use
+
+    Predefined color constants hit the pre-encoded LED_BYTES payloads;
+    ad-hoc tuples are formatted without any clamping or type dispatch.
+    """
+    cached = LED_BYTES.get(color)
+    if cached is not None:
+        send_uart_command_with_bytes(CMD_SET_LED_RGB, cached)
+    else:
+        send_uart_command_with_bytes(CMD_SET_LED_RGB, b"%d,%d,%d" % color)
 
 def set_led_color(color):
-    """Set LED color - flexible function that accepts:
-    
+    """Set LED color - flexible compatibility wrapper that accepts:
+
     Args:
         color: Can be:
             - Predefined color constants: LED_RED, LED_GREEN, LED_BLUE, LED_OFF, etc.
             - RGB tuple: (r, g, b) where each value is 0-255
             - String: "r,g,b" or hex "RRGGBB"
-    
+
     Examples:
         set_led_color(LED_RED)           # Use predefined constant
         set_led_color((255, 128, 0))     # Orange using RGB tuple
         set_led_color("255,0,255")       # Purple using string
         set_led_color("FF00FF")          # Purple using hex
+
+    Internal callers pass validated tuples and should use set_led_tuple
+    directly; this wrapper exists for externally supplied colors.
     """
     if isinstance(color, tuple) and len(color) == 3:
-        # RGB tuple: (r, g, b)
+        # RGB tuple: (r, g, b) - clamp to valid range
         red, green, blue = color
-        # Ensure values are within valid range
         red = max(0, min(255, int(red)))
         green = max(0, min(255, int(green)))
         blue = max(0, min(255, int(blue)))
-        rgb_data = f"{red},{green},{blue}"
+        set_led_tuple((red, green, blue))
     elif isinstance(color, str):
         # String format: "r,g,b" or "RRGGBB"
-        rgb_data = color
+        send_uart_command_with_data(CMD_SET_LED_RGB, color)
     else:
         # Invalid format, default to off
         print(f"Invalid color format: {color}, using LED_OFF")
-        red, green, blue = LED_OFF
-        rgb_data = f"{red},{green},{blue}"
-    
-    send_uart_command_with_data(CMD_SET_LED_RGB, rgb_data)
+        set_led_tuple(LED_OFF)
 
 def start_led_blink(color, blink_count):
     """Start asynchronous LED blinking
@@ -323,278 +449,288 @@ def start_led_blink(color, blink_count):
     led_blink_color = color
     
     # Start with LED on
-    set_led_color(color)
+    set_led_tuple(color)
     led_blink_is_on = True
 
-def update_led_blink():
-    """Update LED blinking state - call this in main loop"""
+def update_led_blink(now):
+    """Update LED blinking state - called every housekeeping tick"""
     global led_blink_active, led_blink_count, led_blink_last_time, led_blink_is_on
     
     if not led_blink_active:
         return
-        
-    current_time = time.ticks_ms()
-    
+
     # Check if it's time to toggle the LED
-    if time.ticks_diff(current_time, led_blink_last_time) >= led_blink_interval:
+    if time.ticks_diff(now, led_blink_last_time) >= led_blink_interval:
         led_blink_count += 1
-        led_blink_last_time = current_time
+        led_blink_last_time = now
         
         # Check if we've completed all blinks
         if led_blink_count >= led_blink_max_count:
             # Finished blinking - turn off LED and stop
-            set_led_color(LED_OFF)
+            set_led_tuple(LED_OFF)
             led_blink_active = False
             led_blink_is_on = False
             return
         
         # Toggle LED state
         if led_blink_is_on:
-            set_led_color(LED_OFF)
+            set_led_tuple(LED_OFF)
             led_blink_is_on = False
         else:
-            set_led_color(led_blink_color)
+            set_led_tuple(led_blink_color)
             led_blink_is_on = True
 
 def handle_motion_detected():
     """Handle motion sensor activation"""
-    global motion_start_time, current_state
-    
-    if current_state == SecurityState.ALARM_DISABLED:
+    if ctx.current_state == STATE_ALARM_DISABLED:
         # Send motion status but don't change state when alarm is disabled
-        safe_mqtt_publish(topic_pub, "MOTION_DETECTED")
-        print("Motion detected (alarm disabled)")
+        safe_mqtt_publish(topic_pub, PUB_MOTION_DETECTED)
+        if DEBUG:
+            print("Motion detected (alarm disabled)")
         return
     
     # Always send MQTT message for motion status
-    safe_mqtt_publish(topic_pub, "MOTION_DETECTED")
+    safe_mqtt_publish(topic_pub, PUB_MOTION_DETECTED)
     
-    if current_state == SecurityState.ALARM_ACTIVE:
+    if ctx.current_state == STATE_ALARM_ACTIVE:
         # Motion detected during active alarm - just report it, don't change state
-        print("Motion detected (alarm already active)")
+        if DEBUG:
+            print("Motion detected (alarm already active)")
         return
     
     # Only change state and start timer if we're in READY state
-    if current_state == SecurityState.READY:
-        motion_start_time = time.ticks_ms()
-        current_state = SecurityState.MOTION_DETECTED
+    if ctx.current_state == STATE_READY:
+        ctx.motion_start_time = time.ticks_ms()
+        ctx.current_state = STATE_MOTION_DETECTED
 
         # Turn on orange LED to indicate motion
-        set_led_color(LED_ORANGE)
-        print("Motion detected - starting 5 second grace period")
+        set_led_tuple(LED_ORANGE)
+        if DEBUG:
+            print("Motion detected - starting 5 second grace period")
 
 def handle_motion_stopped():
     """Handle motion sensor deactivation"""
-    global current_state
-    
-    safe_mqtt_publish(topic_pub, "MOTION_STOPPED")
+    safe_mqtt_publish(topic_pub, PUB_MOTION_STOPPED)
     
-    if current_state == SecurityState.ALARM_DISABLED:
-        print("Motion stopped (alarm disabled)")
+    if ctx.current_state == STATE_ALARM_DISABLED:
+        if DEBUG:
+            print("Motion stopped (alarm disabled)")
         return
     
-    if current_state == SecurityState.ALARM_ACTIVE:
+    if ctx.current_state == STATE_ALARM_ACTIVE:
         # Motion stopped during active alarm - just report it, don't change alarm state
-        print("Motion stopped (alarm remains active)")
+        if DEBUG:
+            print("Motion stopped (alarm remains active)")
         return
     
-    if current_state == SecurityState.MOTION_DETECTED:
+    if ctx.current_state == STATE_MOTION_DETECTED:
         # Motion stopped during grace period - cancel alarm trigger and return to ready
-        current_state = SecurityState.READY
-        set_led_color(LED_OFF)
-        print("Motion stopped - alarm trigger cancelled")
+        ctx.current_state = STATE_READY
+        set_led_tuple(LED_OFF)
+        if DEBUG:
+            print("Motion stopped - alarm trigger cancelled")
         return
     
     # For any other state, just log
-    print("Motion stopped")
+    if DEBUG:
+        print("Motion stopped")
 
-def check_motion_timeout():
+def check_motion_timeout(now):
     """Check if motion has been active long enough to trigger alarm"""
-    global current_state
-    
-    if current_state == SecurityState.MOTION_DETECTED:
-        if time.ticks_diff(time.ticks_ms(), motion_start_time) > motion_grace_period:
+    if ctx.current_state == STATE_MOTION_DETECTED:
+        if time.ticks_diff(now, ctx.motion_start_time) > motion_grace_period:
             activate_alarm()
 
 def activate_alarm():
     """Activate the alarm system (automatic - triggered by motion timeout)"""
-    global current_state, manually_activated
-    
-    if current_state == SecurityState.ALARM_DISABLED:
+    if ctx.current_state == STATE_ALARM_DISABLED:
         return
         
-    current_state = SecurityState.ALARM_ACTIVE
-    manually_activated = False
+    ctx.current_state = STATE_ALARM_ACTIVE
+    ctx.manually_activated = False
     send_uart_command(CMD_SET_BUZZER_ON)
-    set_led_color(LED_RED)
+    set_led_tuple(LED_RED)
     
-    safe_mqtt_publish(topic_pub, "ALARM_TRIGGERED")
-    print("ALARM ACTIVATED - Motion detected for more than 5 seconds")
+    safe_mqtt_publish(topic_pub, PUB_ALARM_TRIGGERED)
+    if DEBUG:
+        print("ALARM ACTIVATED - Motion detected for more than 5 seconds")
 
 def handle_rfid_detected(secret_key):
-    """Handle RFID card detection"""
-    global current_rfid_secret
-    
-    current_rfid_secret = secret_key
-    
-    # Send authentication request to server
-    auth_request = f"AUTH_REQUEST:{secret_key}"
+    """Handle RFID card detection
+
+    secret_key arrives as the raw bytes payload of the UART frame and is
+    copied into the preallocated slot instead of being kept as a fresh
+    object per scan.
+    """
+    global current_rfid_secret_len
+
+    n = min(len(secret_key), rfid_secret_max)
+    current_rfid_secret[:n] = secret_key[:n]
+    current_rfid_secret_len = n
+
+    # Send authentication request to server. Concatenation, not b"%s"
+    # formatting - MicroPython's %s stringifies a bytearray via its repr
+    # instead of splicing the raw bytes
+    auth_request = b"AUTH_REQUEST:" + bytes(secret_key)
     safe_mqtt_publish(topic_auth_request, auth_request)
-    print(f"RFID authentication request sent: {secret_key}")
+    if DEBUG:
+        print(f"RFID authentication request sent: {secret_key}")
 
 def handle_auth_success():
     """Handle successful authentication"""
-    global current_state, alarm_disabled_time
     
     # RFID cannot disable manually activated alarms
-    if manually_activated and current_state == SecurityState.ALARM_ACTIVE:
-        print("Authentication successful but alarm is manually activated - RFID disable blocked")
-        safe_mqtt_publish(topic_auth_request, "ACK_AUTH_SUCCESS")
-        safe_mqtt_publish(topic_pub, "AUTH_SUCCESS_BLOCKED")
+    if ctx.manually_activated and ctx.current_state == STATE_ALARM_ACTIVE:
+        if DEBUG:
+            print("Authentication successful but alarm is manually activated - RFID disable blocked")
+        safe_mqtt_publish(topic_auth_request, PUB_ACK_AUTH_SUCCESS)
+        safe_mqtt_publish(topic_pub, PUB_AUTH_SUCCESS_BLOCKED)
+        _flush_mqtt()  # Both messages ride one TCP burst
         return
     
-    print("Authentication successful - disabling alarm")
-    current_state = SecurityState.ALARM_DISABLED
-    alarm_disabled_time = time.ticks_ms()
+    if DEBUG:
+        print("Authentication successful - disabling alarm")
+    ctx.current_state = STATE_ALARM_DISABLED
+    ctx.alarm_disabled_time = time.ticks_ms()
     
     send_uart_command(CMD_SET_BUZZER_OFF)
-    set_led_color(LED_GREEN)
+    set_led_tuple(LED_GREEN)
 
-    safe_mqtt_publish(topic_auth_request, "ACK_AUTH_SUCCESS")
-    safe_mqtt_publish(topic_pub, "ALARM_DISABLED_RFID")
+    safe_mqtt_publish(topic_auth_request, PUB_ACK_AUTH_SUCCESS)
+    safe_mqtt_publish(topic_pub, PUB_ALARM_DISABLED_RFID)
+    _flush_mqtt()  # Both messages ride one TCP burst
     
 
 def handle_auth_failed():
     """Handle failed authentication"""
-    print("Authentication failed")
+    if DEBUG:
+        print("Authentication failed")
     
     # Start asynchronous red LED blinking (3 times) to indicate authentication failure
     start_led_blink(LED_RED, 3)
     
-    safe_mqtt_publish(topic_auth_request, "ACK_AUTH_FAILED")
-    safe_mqtt_publish(topic_pub, "AUTH_FAILED")
+    safe_mqtt_publish(topic_auth_request, PUB_ACK_AUTH_FAILED)
+    safe_mqtt_publish(topic_pub, PUB_AUTH_FAILED)
+    _flush_mqtt()  # Both messages ride one TCP burst
 
 def handle_button_pressed():
     """Handle rearm button press - same as reset alarm from app"""
-    print("Rearm button pressed - resetting alarm")
+    if DEBUG:
+        print("Rearm button pressed - resetting alarm")
     reset_alarm()
 
 def disable_alarm():
     """Disable alarm via MQTT command"""
-    global current_state
-    
-    print("Alarm disabled via MQTT command")
-    current_state = SecurityState.ALARM_DISABLED
+    if DEBUG:
+        print("Alarm disabled via MQTT command")
+    ctx.current_state = STATE_ALARM_DISABLED
     
     send_uart_command(CMD_SET_BUZZER_OFF)
-    set_led_color(LED_GREEN)
+    set_led_tuple(LED_GREEN)
     
-    safe_mqtt_publish(topic_pub, "ACK_CMD_DISABLE_ALARM")
+    safe_mqtt_publish(topic_pub, PUB_ACK_CMD_DISABLE_ALARM)
 
 def activate_alarm_manual():
     """Manually activate the alarm system (cannot be disabled by RFID)"""
-    global current_state, manually_activated, alarm_disable_permanent, alarm_disable_end_time
-    
-    print("Alarm manually activated - RFID disable blocked")
-    current_state = SecurityState.ALARM_ACTIVE
-    manually_activated = True
-    alarm_disable_permanent = False
-    alarm_disable_end_time = 0
+    if DEBUG:
+        print("Alarm manually activated - RFID disable blocked")
+    ctx.current_state = STATE_ALARM_ACTIVE
+    ctx.manually_activated = True
+    ctx.alarm_disable_permanent = False
+    ctx.alarm_disable_end_time = 0
     
     send_uart_command(CMD_SET_BUZZER_ON)
-    set_led_color(LED_RED)
+    set_led_tuple(LED_RED)
     
-    safe_mqtt_publish(topic_pub, "ALARM_TRIGGERED")
-    safe_mqtt_publish(topic_pub, "ACK_CMD_ACTIVATE_ALARM")
+    safe_mqtt_publish(topic_pub, PUB_ALARM_TRIGGERED)
+    safe_mqtt_publish(topic_pub, PUB_ACK_CMD_ACTIVATE_ALARM)
+    _flush_mqtt()  # Both messages ride one TCP burst
 
 def disable_alarm_permanent():
     """Permanently disable alarm until manually reactivated"""
-    global current_state, manually_activated, alarm_disable_permanent, alarm_disable_end_time
-    
-    print("Alarm permanently disabled")
-    current_state = SecurityState.ALARM_DISABLED
-    manually_activated = False
-    alarm_disable_permanent = True
-    alarm_disable_end_time = 0
+    if DEBUG:
+        print("Alarm permanently disabled")
+    ctx.current_state = STATE_ALARM_DISABLED
+    ctx.manually_activated = False
+    ctx.alarm_disable_permanent = True
+    ctx.alarm_disable_end_time = 0
     
     send_uart_command(CMD_SET_BUZZER_OFF)
-    set_led_color(LED_GREEN)
+    set_led_tuple(LED_GREEN)
     
-    safe_mqtt_publish(topic_pub, "ACK_CMD_DISABLE_ALARM")
+    safe_mqtt_publish(topic_pub, PUB_ACK_CMD_DISABLE_ALARM)
 
 def disable_alarm_timed(minutes):
     """Disable alarm for specified number of minutes"""
-    global current_state, manually_activated, alarm_disable_permanent, alarm_disable_end_time
-    
-    print(f"Alarm disabled for {minutes} minutes")
-    current_state = SecurityState.ALARM_DISABLED
-    manually_activated = False
-    alarm_disable_permanent = False
-    alarm_disable_end_time = time.ticks_ms() + (minutes * 60 * 1000)
+    if DEBUG:
+        print(f"Alarm disabled for {minutes} minutes")
+    ctx.current_state = STATE_ALARM_DISABLED
+    ctx.manually_activated = False
+    ctx.alarm_disable_permanent = False
+    ctx.alarm_disable_end_time = time.ticks_ms() + (minutes * 60 * 1000)
     
     send_uart_command(CMD_SET_BUZZER_OFF)
-    set_led_color(LED_GREEN)
+    set_led_tuple(LED_GREEN)
     
-    safe_mqtt_publish(topic_pub, "ACK_CMD_DISABLE_ALARM")
+    safe_mqtt_publish(topic_pub, PUB_ACK_CMD_DISABLE_ALARM)
 
 def enable_alarm():
     """Re-enable alarm system"""
-    global current_state, manually_activated, alarm_disable_permanent, alarm_disable_end_time
-    
-    print("Alarm re-enabled")
-    current_state = SecurityState.READY
-    manually_activated = False
-    alarm_disable_permanent = False
-    alarm_disable_end_time = 0
+    if DEBUG:
+        print("Alarm re-enabled")
+    ctx.current_state = STATE_READY
+    ctx.manually_activated = False
+    ctx.alarm_disable_permanent = False
+    ctx.alarm_disable_end_time = 0
     
     send_uart_command(CMD_SET_BUZZER_OFF)
-    set_led_color(LED_OFF)
+    set_led_tuple(LED_OFF)
     
-    safe_mqtt_publish(topic_pub, "SECURITY_STATE:READY")
+    safe_mqtt_publish(topic_pub, PUB_SECURITY_STATE_READY)
 
 def reset_alarm():
     """Reset/rearm alarm - stop active alarm and return to ready state immediately"""
-    global current_state, manually_activated, alarm_disable_permanent, alarm_disable_end_time
-    
-    print("Alarm reset and rearmed")
-    current_state = SecurityState.READY
-    manually_activated = False
-    alarm_disable_permanent = False
-    alarm_disable_end_time = 0
+    if DEBUG:
+        print("Alarm reset and rearmed")
+    ctx.current_state = STATE_READY
+    ctx.manually_activated = False
+    ctx.alarm_disable_permanent = False
+    ctx.alarm_disable_end_time = 0
     
     send_uart_command(CMD_SET_BUZZER_OFF)
-    set_led_color(LED_OFF)
+    set_led_tuple(LED_OFF)
     
     # Notify the client that alarm was reset
-    safe_mqtt_publish(topic_pub, "ALARM_RESET")
-    safe_mqtt_publish(topic_pub, "SECURITY_STATE:READY")
+    safe_mqtt_publish(topic_pub, PUB_ALARM_RESET)
+    safe_mqtt_publish(topic_pub, PUB_SECURITY_STATE_READY)
+    _flush_mqtt()  # Both messages ride one TCP burst
 
 def prepare_rfid_write_mode(secret_key):
     """Prepare for RFID write mode (step 1 - store key but don't activate)"""
-    global current_state
-    
-    print(f"Preparing RFID write mode with key: {secret_key}")
-    current_state = SecurityState.RFID_WRITE_MODE
+    if DEBUG:
+        print(f"Preparing RFID write mode with key: {secret_key}")
+    ctx.current_state = STATE_RFID_WRITE_MODE
     
     # Send prepare command to Arduino - it will store the key but not activate write mode
     send_uart_command_with_data(CMD_RFID_WRITE_PREPARE, secret_key)
     
     # Indicate preparation is ready
-    safe_mqtt_publish(topic_pub, f"STATUS_RFID_WRITE_PREPARED:{secret_key}")
+    safe_mqtt_publish(topic_pub, b"STATUS_RFID_WRITE_PREPARED:" + secret_key.encode('utf-8'))
 
 def confirm_rfid_write_mode():
     """Confirm and activate RFID write mode (step 2 - actually enter write mode)"""
-    if current_state == SecurityState.RFID_WRITE_MODE:
-        print("Confirming RFID write mode - activating write mode")
+    if ctx.current_state == STATE_RFID_WRITE_MODE:
+        if DEBUG:
+            print("Confirming RFID write mode - activating write mode")
         
         # Send confirm command to Arduino - it will now activate write mode
         send_uart_command(CMD_RFID_WRITE_CONFIRM)
         
         # Indicate write mode is now active
-        safe_mqtt_publish(topic_pub, "STATUS_RFID_WRITE_ACTIVE")
+        safe_mqtt_publish(topic_pub, PUB_STATUS_RFID_WRITE_ACTIVE)
     else:
         print("Error: Cannot confirm RFID write - not in prepared state")
-        safe_mqtt_publish(topic_pub, "ERROR_RFID_WRITE_NOT_PREPARED")
+        safe_mqtt_publish(topic_pub, PUB_ERROR_RFID_WRITE_NOT_PREPARED)
 
 def enter_rfid_write_mode(secret_key):
     """Legacy function - now calls the two-step process"""
@@ -602,41 +738,41 @@ def enter_rfid_write_mode(secret_key):
 
 def initialize_rfid_write():
     """Initialize RFID write operation"""
-    if current_state == SecurityState.RFID_WRITE_MODE:
-        print("RFID write initialized")
-        safe_mqtt_publish(topic_pub, "ACK_CMD_RFID_WRITE_INITALIZE")
+    if ctx.current_state == STATE_RFID_WRITE_MODE:
+        if DEBUG:
+            print("RFID write initialized")
+        safe_mqtt_publish(topic_pub, PUB_ACK_CMD_RFID_WRITE_INITALIZE)
 
 def abort_operation():
     """Abort current operation"""
-    global current_state
-    
-    print("Aborting current operation")
-    current_state = SecurityState.READY
+    if DEBUG:
+        print("Aborting current operation")
+    ctx.current_state = STATE_READY
     
     send_uart_command(CMD_RFID_NORMAL_MODE)
-    set_led_color(LED_OFF)
+    set_led_tuple(LED_OFF)
     
-    safe_mqtt_publish(topic_pub, "ACK_CMD_ABORT")
+    safe_mqtt_publish(topic_pub, PUB_ACK_CMD_ABORT)
 
-def check_alarm_timeout():
+def check_alarm_timeout(now):
     """Check if alarm disable period has expired"""
-    global current_state, alarm_disable_permanent, alarm_disable_end_time
-    
-    if current_state == SecurityState.ALARM_DISABLED:
+    if ctx.current_state == STATE_ALARM_DISABLED:
         # Don't re-enable if permanently disabled
-        if alarm_disable_permanent:
+        if ctx.alarm_disable_permanent:
             return
             
         # Check if timed disable has expired
-        if alarm_disable_end_time > 0 and time.ticks_ms() >= alarm_disable_end_time:
-            print("Alarm re-enabled after timed disable")
+        if ctx.alarm_disable_end_time > 0 and now >= ctx.alarm_disable_end_time:
+            if DEBUG:
+                print("Alarm re-enabled after timed disable")
             enable_alarm()
         # Legacy timeout check (for old RFID disable behavior)
-        elif alarm_disable_end_time == 0 and time.ticks_diff(time.ticks_ms(), alarm_disabled_time) > alarm_disable_duration:
-            print("Alarm re-enabled after legacy timeout")
-            current_state = SecurityState.READY
-            set_led_color(LED_OFF)
-            safe_mqtt_publish(topic_pub, "ALARM_REARMED")
+        elif ctx.alarm_disable_end_time == 0 and time.ticks_diff(now, ctx.alarm_disabled_time) > alarm_disable_duration:
+            if DEBUG:
+                print("Alarm re-enabled after legacy timeout")
+            ctx.current_state = STATE_READY
+            set_led_tuple(LED_OFF)
+            safe_mqtt_publish(topic_pub, PUB_ALARM_REARMED)
 
 def handle_arduino_heartbeat():
     """Handle heartbeat message from Arduino"""
@@ -645,210 +781,284 @@ def handle_arduino_heartbeat():
     last_arduino_heartbeat = time.ticks_ms()
     
     # Always send Arduino heartbeat to client
-    safe_mqtt_publish(topic_pub, "ARDUINO_HEARTBEAT")
-    print("Arduino heartbeat received and relayed to client")
+    safe_mqtt_publish(topic_pub, PUB_ARDUINO_HEARTBEAT)
+    if DEBUG:
+        print("Arduino heartbeat received and relayed to client")
     
     if not arduino_connected:
         arduino_connected = True
-        print("Arduino connection restored")
-        safe_mqtt_publish(topic_pub, "ARDUINO_CONNECTED")
+        if DEBUG:
+            print("Arduino connection restored")
+        safe_mqtt_publish(topic_pub, PUB_ARDUINO_CONNECTED)
 
 def handle_arduino_status_update():
     """Handle status update message from Arduino"""
     # This function is now handled in the UART message parsing section
     # where messages with data are processed
-    print("Status update handled in main UART parser")
+    if DEBUG:
+        print("Status update handled in main UART parser")
 
-def check_arduino_connection():
+def check_arduino_connection(now):
     """Check if Arduino is still connected based on heartbeat"""
     global arduino_connected
     
     if arduino_connected:
-        time_since_heartbeat = time.ticks_diff(time.ticks_ms(), last_arduino_heartbeat)
+        time_since_heartbeat = time.ticks_diff(now, last_arduino_heartbeat)
         if time_since_heartbeat > arduino_timeout:
             arduino_connected = False
             print("Arduino connection lost - no heartbeat")
-            safe_mqtt_publish(topic_pub, "ARDUINO_DISCONNECTED")
-
-def send_pico_heartbeat():
-    """Send periodic heartbeat from Pico to indicate it's alive"""
-    safe_mqtt_publish(topic_pub, "PICO_HEARTBEAT")
-    print("Pico heartbeat sent")
+            safe_mqtt_publish(topic_pub, PUB_ARDUINO_DISCONNECTED)
 
 def test_mqtt_publishing():
     """Test function to manually verify MQTT publishing works"""
     print("Testing MQTT publishing...")
     messages = [
-        "TEST_MESSAGE_1",
-        "PICO_HEARTBEAT", 
-        "MOTION_DETECTED",
-        "MOTION_STOPPED",
-        "ARDUINO_CONNECTED"
+        b"TEST_MESSAGE_1",
+        PUB_PICO_READY,
+        PUB_MOTION_DETECTED,
+        PUB_MOTION_STOPPED,
+        PUB_ARDUINO_CONNECTED
     ]
     
     for msg in messages:
         print(f"Sending test message: {msg}")
-        if safe_mqtt_publish(topic_pub, msg):
+        if safe_mqtt_publish(topic_pub, msg, flush=True):
             print(f"✓ {msg} sent successfully")
         else:
             print(f"✗ Failed to send {msg}")
         time.sleep(1)  # Wait 1 second between messages
 
-def process_arduino_message(msg_code):
-    """Process message codes from Arduino"""
-    
-    if msg_code == MSG_STATUS_READY:
+def handle_arduino_ready():
+    """Handle ready status from Arduino"""
+    if DEBUG:
         print("Arduino ready")
-        safe_mqtt_publish(topic_pub, "STATUS_READY")
-        
-    elif msg_code == MSG_MOTION_DETECTED:
-        handle_motion_detected()
-        
-    elif msg_code == MSG_MOTION_STOPPED:
-        handle_motion_stopped()
-        
-    elif msg_code == MSG_RFID_DETECTED:
+    safe_mqtt_publish(topic_pub, PUB_STATUS_READY)
+
+def handle_rfid_card_detected():
+    """Handle RFID card detection notification (authentication follows separately)"""
+    if DEBUG:
         print("RFID card detected")
-        
-    elif msg_code == MSG_BUTTON_PRESSED:
-        handle_button_pressed()
-        
-    elif msg_code == MSG_RFID_WRITE_SUCCESS:
+
+def handle_rfid_write_success():
+    """Handle successful RFID write from Arduino"""
+    if DEBUG:
         print("RFID write successful")
-        safe_mqtt_publish(topic_pub, "STATUS_RFID_WRITE_SUCCESS")
-        
-    elif msg_code == MSG_RFID_WRITE_FAILED:
+    safe_mqtt_publish(topic_pub, PUB_STATUS_RFID_WRITE_SUCCESS)
+
+def handle_rfid_write_failed():
+    """Handle failed RFID write from Arduino"""
+    if DEBUG:
         print("RFID write failed")
-        safe_mqtt_publish(topic_pub, "STATUS_RFID_WRITE_FAILED")
-        
-    elif msg_code == MSG_RFID_WRITE_COMPLETED:
+    safe_mqtt_publish(topic_pub, PUB_STATUS_RFID_WRITE_FAILED)
+
+def handle_rfid_write_completed():
+    """Handle RFID write completion - return to ready state"""
+
+    if DEBUG:
         print("RFID write completed")
-        safe_mqtt_publish(topic_pub, "STATUS_RFID_WRITE_COMPLETED")
-        current_state = SecurityState.READY
-        set_led_color(LED_OFF)
-        
-    elif msg_code == MSG_HEARTBEAT:
-        handle_arduino_heartbeat()
-        
-    elif msg_code == MSG_STATUS_UPDATE:
-        handle_arduino_status_update()
-        
+    safe_mqtt_publish(topic_pub, PUB_STATUS_RFID_WRITE_COMPLETED)
+    ctx.current_state = STATE_READY
+    set_led_tuple(LED_OFF)
+
+def handle_rfid_read_failed(data):
+    """Handle failed RFID read from Arduino"""
+    if DEBUG:
+        print("RFID read failed")
+    safe_mqtt_publish(topic_pub, PUB_RFID_READ_FAILED)
+
+def handle_arduino_status_data(data):
+    """Relay an Arduino status update payload to the client"""
+    if DEBUG:
+        print(f"Arduino status update: {data}")
+    safe_mqtt_publish(topic_pub, b"ARDUINO_STATUS:" + bytes(data))
+
+def handle_arduino_heartbeat_data(data):
+    """Heartbeat frames carry no useful payload - treat like a bare heartbeat"""
+    handle_arduino_heartbeat()
+
+# Jump tables for message dispatch - a dict lookup instead of long if/elif chains
+ARDUINO_DISPATCH = {
+    MSG_STATUS_READY: handle_arduino_ready,
+    MSG_MOTION_DETECTED: handle_motion_detected,
+    MSG_MOTION_STOPPED: handle_motion_stopped,
+    MSG_RFID_DETECTED: handle_rfid_card_detected,
+    MSG_BUTTON_PRESSED: handle_button_pressed,
+    MSG_RFID_WRITE_SUCCESS: handle_rfid_write_success,
+    MSG_RFID_WRITE_FAILED: handle_rfid_write_failed,
+    MSG_RFID_WRITE_COMPLETED: handle_rfid_write_completed,
+    MSG_HEARTBEAT: handle_arduino_heartbeat,
+    MSG_STATUS_UPDATE: handle_arduino_status_update,
+}
+
+# Handlers for "code:data" frames - each takes the decoded data as argument
+ARDUINO_DATA_DISPATCH = {
+    MSG_RFID_READ_SUCCESS: handle_rfid_detected,
+    MSG_RFID_READ_FAILED: handle_rfid_read_failed,
+    MSG_STATUS_UPDATE: handle_arduino_status_data,
+    MSG_HEARTBEAT: handle_arduino_heartbeat_data,
+}
+
+def disable_alarm_timed_cmd(arg):
+    """Adapter for the CMD_DISABLE_ALARM_TIMED:<minutes> command"""
+    disable_alarm_timed(int(arg))
+
+# Handlers for parameterized "PREFIX:arg" MQTT commands - each takes the
+# argument portion of the message
+MQTT_PARAM_DISPATCH = {
+    "CMD_DISABLE_ALARM_TIMED": disable_alarm_timed_cmd,
+    "CMD_RFID_WRITE_PREPARE": prepare_rfid_write_mode,
+}
+
+# Handlers for exact-match MQTT commands
+MQTT_DISPATCH = {
+    "CMD_DISABLE_ALARM": disable_alarm,
+    "CMD_ACTIVATE_ALARM": activate_alarm_manual,
+    "CMD_RESET_ALARM": reset_alarm,
+    "CMD_DISABLE_ALARM_PERMANENT": disable_alarm_permanent,
+    "CMD_ENABLE_ALARM": enable_alarm,
+    "CMD_RFID_WRITE_CONFIRM": confirm_rfid_write_mode,
+    "CMD_ABORT": abort_operation,
+    "CMD_RFID_WRITE_INITALIZE": initialize_rfid_write,
+}
+
+def handle_uart_data_frame(frame):
+    """Handle a complete "code:data" frame from the Arduino"""
+    if DEBUG:
+        print("Received UART message with data:", frame)
+    try:
+        parts = frame.split(b':', 1)
+        if len(parts) == 2 and len(parts[0]) >= 1:
+            msg_code = parts[0][0]  # First byte is the message code
+            data = parts[1].strip()  # Raw bytes - handlers decode only if they need text
+
+            if DEBUG:
+                print(f"Parsed: msg_code={msg_code}, data='{data}'")
+
+            handler = ARDUINO_DATA_DISPATCH.get(msg_code)
+            if handler:
+                handler(data)
+            else:
+                print(f"Unknown message code with data: {msg_code}")
+        else:
+            print(f"Invalid message format: {frame}")
+    except Exception as e:
+        print(f"Error parsing message: {e}, buffer: {frame}")
+
+def process_arduino_message(msg_code):
+    """Process single-byte message codes from Arduino"""
+    handler = ARDUINO_DISPATCH.get(msg_code)
+    if handler:
+        handler()
     else:
         print(f"Unknown message code from Arduino: {msg_code}")
 
-# Buffer for UART data
-uart_buffer = b''
+# Accumulation buffer for UART data - a bytearray so appending received
+# chunks is amortized O(1) instead of rebuilding an immutable bytes
+# object on every append
+uart_buffer = bytearray()
 
 # Connection monitoring
 last_mqtt_check = time.ticks_ms()
-mqtt_check_interval = 30000  # Check MQTT connection every 30 seconds
+# Must stay comfortably below the 20s MQTT keepalive - umqtt never pings
+# on its own and the broker drops the connection after 1.5x keepalive of
+# silence, so this interval is the only thing keeping an idle link alive
+mqtt_check_interval = const(10000)  # Ping the broker every 10 seconds
 
-print("Security system initialized")
+# Scheduled garbage collection - collect in quiescent windows so an
+# implicit GC pause never lands in the middle of an event
+last_gc = 0
+gc_interval = const(5000)  # Collect at most every 5 seconds
 
-# Send initial status to indicate Pico is ready
-safe_mqtt_publish(topic_pub, "PICO_READY")
+# Cooperative tasks - each periodic job runs as its own coroutine and the
+# scheduler sleeps between deadlines instead of busy-polling everything
+# on every iteration of one monolithic loop
 
-# Main loop
-while True:
-    current_time = time.ticks_ms()
-    
-    # Send Pico heartbeat every 15 seconds
-    if time.ticks_diff(current_time, last_pico_heartbeat) > pico_heartbeat_interval:
-        send_pico_heartbeat()
-        last_pico_heartbeat = current_time
-    
-    # Periodic MQTT connection check
-    if client and time.ticks_diff(current_time, last_mqtt_check) > mqtt_check_interval:
-        try:
-            client.ping()
-            last_mqtt_check = current_time
-        except Exception as e:
-            print(f"MQTT ping failed: {e} - attempting reconnect")
-            client = connect_mqtt()
-            last_mqtt_check = current_time
-    
-    # Check MQTT messages
-    safe_mqtt_check()
-    
-    # Check timeouts
-    check_motion_timeout()
-    check_alarm_timeout()
-    check_arduino_connection()
-    
-    # Update LED blinking (non-blocking)
-    update_led_blink()
-    
-    # Process UART data from Arduino
-    while uart.any():
-        c = uart.read(1)
-        if c:
-            byte_val = c[0]
-            print(f"Received UART data: {byte_val} (0x{byte_val:02x})")
-            
-            if c == b'\n':
-                # End of multi-byte message with data
-                if uart_buffer and b':' in uart_buffer:
-                    # Message with data (format: "code:data")
-                    print("Received UART message with data:", uart_buffer)
-                    try:
-                        parts = uart_buffer.split(b':', 1)
-                        if len(parts) == 2 and len(parts[0]) >= 1:
-                            msg_code = parts[0][0]  # First byte is the message code
-                            data = parts[1].decode('utf-8').strip()
-                            
-                            print(f"Parsed: msg_code={msg_code}, data='{data}'")
-                            
-                            if msg_code == MSG_RFID_READ_SUCCESS:
-                                handle_rfid_detected(data)
-                            elif msg_code == MSG_RFID_READ_FAILED:
-                                print("RFID read failed")
-                                safe_mqtt_publish(topic_pub, "RFID_READ_FAILED")
-                            elif msg_code == MSG_STATUS_UPDATE:
-                                print(f"Arduino status update: {data}")
-                                safe_mqtt_publish(topic_pub, f"ARDUINO_STATUS:{data}")
-                            elif msg_code == MSG_HEARTBEAT:
-                                handle_arduino_heartbeat()
-                            else:
-                                print(f"Unknown message code with data: {msg_code}")
-                        else:
-                            print(f"Invalid message format: {uart_buffer}")
-                    except Exception as e:
-                        print(f"Error parsing message: {e}, buffer: {uart_buffer}")
-                
-                uart_buffer = b''
-                
+async def mqtt_task():
+    """Poll inbound MQTT messages, flush the outbound queue and keep the connection alive"""
+    global client, last_mqtt_check
+
+    while True:
+        # Periodic MQTT connection check
+        if client and time.ticks_diff(time.ticks_ms(), last_mqtt_check) > mqtt_check_interval:
+            try:
+                client.ping()
+            except Exception as e:
+                print(f"MQTT ping failed: {e} - attempting reconnect")
+                client = connect_mqtt()
+            last_mqtt_check = time.ticks_ms()
+
+        # Check MQTT messages
+        safe_mqtt_check()
+
+        # Flush any MQTT messages queued by the handlers in one burst
+        _flush_mqtt()
+
+        await asyncio.sleep_ms(20)
+
+async def uart_task():
+    """Drain the UART and dispatch complete frames from the Arduino"""
+    while True:
+        # Read all pending bytes in one call
+        pending = uart.any()
+        if pending:
+            data = uart.read(pending)
+            if data:
+                uart_buffer.extend(data)
+
+        # Parse complete newline-terminated frames from the buffer
+        while True:
+            newline_pos = uart_buffer.find(b'\n')
+            if newline_pos < 0:
+                break  # No complete frame yet
+
+            frame = uart_buffer[:newline_pos]
+            # Slice assignment, not `del buf[:n]` - MicroPython bytearrays
+            # don't support slice deletion
+            uart_buffer[:newline_pos + 1] = b""
+
+            if not frame:
+                continue  # Empty frame - ignore
+            if len(frame) == 1:
+                if DEBUG:
+                    print(f"Received single-byte message: {frame[0]}")
+                process_arduino_message(frame[0])
             else:
-                uart_buffer += c
-                
-                # Check if this is a potential single-byte message
-                if len(uart_buffer) == 1 and 1 <= byte_val <= 28:
-                    # This could be a single-byte message or start of multi-byte message
-                    # Wait a short time to see if ':' follows
-                    start_time = time.ticks_ms()
-                    timeout = 10  # 10ms timeout
-                    
-                    while time.ticks_diff(time.ticks_ms(), start_time) < timeout:
-                        if uart.any():
-                            # More data is available, peek at it
-                            next_byte = uart.read(1)
-                            if next_byte:
-                                if next_byte == b':':
-                                    # This is a multi-byte message, add ':' to buffer and continue
-                                    uart_buffer += next_byte
-                                    print(f"Multi-byte message detected: {byte_val}:")
-                                    break
-                                else:
-                                    # Put the byte back in buffer and process as single-byte
-                                    uart_buffer += next_byte
-                                    print(f"Received single-byte message: {byte_val}")
-                                    process_arduino_message(byte_val)
-                                    uart_buffer = next_byte  # Keep the next byte for next iteration
-                                    break
-                        time.sleep(0.001)
-                    else:
-                        # Timeout - no more data, this is a single-byte message
-                        print(f"Received single-byte message: {byte_val}")
-                        process_arduino_message(byte_val)
-                        uart_buffer = b''
-    
-    time.sleep(0.001)
\ No newline at end of file
+                handle_uart_data_frame(frame)
+
+        await asyncio.sleep_ms(5)
+
+async def housekeeping_task():
+    """Check motion/alarm/heartbeat timeouts and drive the LED blink state"""
+    global last_gc
+
+    while True:
+        # One sampled timestamp per tick keeps every deadline check
+        # consistent and avoids three extra ticks_ms calls
+        now = time.ticks_ms()
+        check_motion_timeout(now)
+        check_alarm_timeout(now)
+        check_arduino_connection(now)
+        update_led_blink(now)
+
+        # Collect while the system is idle; gc.threshold re-arms an
+        # automatic collection at a predictable high-water mark in case
+        # a burst of events outruns the schedule
+        if ctx.current_state == STATE_READY and time.ticks_diff(now, last_gc) > gc_interval:
+            gc.collect()
+            gc.threshold(gc.mem_free() // 4 + gc.mem_alloc())
+            last_gc = now
+
+        await asyncio.sleep_ms(50)
+
+async def main():
+    print("Security system initialized")
+
+    # connect_mqtt already announced PICO_READY (retained) on connect
+
+    await asyncio.gather(
+        asyncio.create_task(mqtt_task()),
+        asyncio.create_task(uart_task()),
+        asyncio.create_task(housekeeping_task()),
+    )
+
+asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,8 @@
+# Freeze manifest for building the security system into the MicroPython
+# firmware. Frozen bytecode executes from XIP flash instead of being
+# compiled onto the GC heap at boot, freeing ~10 KB of RAM.
+#
+# Usage (from a MicroPython checkout):
+#   make -C ports/rp2 BOARD=RPI_PICO_W FROZEN_MANIFEST=/path/to/SecSys/Pico/manifest.py
+include("$(PORT_DIR)/boards/manifest.py")
+freeze(".", "main.py")
@@ -19,9 +19,9 @@ public class SensorStatusService implements MqttService.MqttMessageListener {
     private final List<SensorStatusListener> listeners = new ArrayList<>();
     private final Object listenersLock = new Object();
     
-    // Timeout settings (in seconds)
+    // Timeout settings (in seconds). The Pico has no timeout here - its
+    // liveness is signalled by the broker's last-will PICO_OFFLINE message.
     private static final long ARDUINO_TIMEOUT = 60; // 60 seconds
-    private static final long PICO_TIMEOUT = 60;    // 60 seconds
     private static final long MQTT_TIMEOUT = 60;    // 60 seconds
     
     /**
@@ -136,14 +136,6 @@ public class SensorStatusService implements MqttService.MqttMessageListener {
                         updateSensorStatus(SensorType.ARDUINO, Status.ERROR, "Communication timeout");
                     }
                     break;
-                case PICO:
-                    if (secondsSinceUpdate > PICO_TIMEOUT && status.getStatus() != Status.ERROR) {
-                        System.out.println("SensorStatusService: Pico timeout detected - " + secondsSinceUpdate + "s since last update (limit: " + PICO_TIMEOUT + "s)");
-                        updateSensorStatus(SensorType.PICO, Status.ERROR, "Communication timeout");
-                        // If Pico times out, Arduino and motion sensor are also unreachable
-                        updateSensorStatus(SensorType.MOTION_SENSOR, Status.ERROR, "Communication Error!");
-                    }
-                    break;
                 case NETWORK:
                     if (secondsSinceUpdate > MQTT_TIMEOUT && status.getStatus() != Status.ERROR) {
                         System.out.println("SensorStatusService: Network timeout detected - " + secondsSinceUpdate + "s since last update (limit: " + MQTT_TIMEOUT + "s)");
@@ -187,7 +179,16 @@ public class SensorStatusService implements MqttService.MqttMessageListener {
         
         // Update network status on any message received
         updateSensorStatus(SensorType.NETWORK, Status.ACTIVE, "MQTT active");
-        
+
+        // Every event on the events topic is relayed through the Pico, so
+        // any message there proves the Pico is alive - except the will
+        // message, which the broker publishes on the Pico's behalf after
+        // it died. Other topics (e.g. the command topic) carry our own
+        // publishes and must not count as Pico liveness.
+        if ("home/arduino/events".equals(topic) && !"PICO_OFFLINE".equals(message)) {
+            updateSensorStatus(SensorType.PICO, Status.ACTIVE, "Active");
+        }
+
         try {
             switch (message) {
                 case "STATUS_READY":
@@ -207,8 +208,11 @@ public class SensorStatusService implements MqttService.MqttMessageListener {
                     updateSensorStatus(SensorType.ARDUINO, Status.ACTIVE, "Active");
                     break;
                     
-                case "PICO_HEARTBEAT":
-                    updateSensorStatus(SensorType.PICO, Status.ACTIVE, "Connected");
+                case "PICO_OFFLINE":
+                    // Broker-published last will - the Pico dropped off without disconnecting cleanly
+                    updateSensorStatus(SensorType.PICO, Status.ERROR, "Offline");
+                    // With the Pico gone, the motion sensor is unreachable too
+                    updateSensorStatus(SensorType.MOTION_SENSOR, Status.ERROR, "Communication Error!");
                     break;
                     
                 case "ARDUINO_DISCONNECTED":